@@ -1,15 +1,34 @@
 import os
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
 from dotenv import load_dotenv
 
 from .routes import api
+from .services.agent import detect_vertex_mode
+from .services.http_client import close_client
 
 load_dotenv()
 
-app = FastAPI(title="AI Agent App", version="0.1.0")
+
+class _GZipMiddleware(GZipMiddleware):
+    # GZipMiddleware buffers streamed bodies, which would hold back Server-Sent Events
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "text/event-stream" in Headers(scope=scope).get("accept", ""):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app = FastAPI(title="AI Agent App", version="0.1.0", default_response_class=ORJSONResponse)
+
+app.add_middleware(_GZipMiddleware, minimum_size=1024)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +47,58 @@ templates_dir = os.path.join(base_dir, "templates")
 if os.path.exists(static_dir):
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
+# The template is static, so read it once instead of on every request
+index_path = os.path.join(templates_dir, "index.html")
+if os.path.exists(index_path):
+    with open(index_path, "rb") as f:
+        _INDEX_HTML = f.read()
+else:
+    _INDEX_HTML = b"<h1>Gemini Agent API</h1><p>API is running. Use /api/chat endpoint.</p>"
+
+
+_log_listener = None
+_log_handler = None
+
+
+def _start_log_listener():
+    # Log records are queued on the event loop thread and written to stderr by a
+    # background thread, so request handlers never block on the write syscall
+    global _log_listener, _log_handler
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    _log_handler = QueueHandler(log_queue)
+    logging.getLogger().addHandler(_log_handler)
+    _log_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _log_listener.start()
+
+
+def _stop_log_listener():
+    # Detach the handler too, so a later startup doesn't stack a second one on the root logger
+    global _log_listener, _log_handler
+    if _log_handler is not None:
+        logging.getLogger().removeHandler(_log_handler)
+        _log_handler = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+@app.on_event("startup")
+async def startup():
+    _start_log_listener()
+    # Probe the metadata server once instead of on every request
+    app.state.vertex_mode = await detect_vertex_mode()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_client()
+    _stop_log_listener()
+
 
 @app.get("/health")
 async def health():
@@ -37,11 +108,6 @@ async def health():
 
 @app.get("/", response_class=HTMLResponse)
 async def index(_: Request):
-    index_path = os.path.join(templates_dir, "index.html")
-    if os.path.exists(index_path):
-        with open(index_path, "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read(), status_code=200)
-    else:
-        return HTMLResponse(content="<h1>Gemini Agent API</h1><p>API is running. Use /api/chat endpoint.</p>", status_code=200)
+    return HTMLResponse(content=_INDEX_HTML, status_code=200, headers={"Cache-Control": "public, max-age=300"})
 
 
@@ -1,26 +1,17 @@
 import logging
-from datetime import datetime
+import traceback
+
+import orjson
 from fastapi import APIRouter, Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from ..services.agent import run_agent
+from ..services.agent import run_agent, stream_agent
 
-# Set up logger
+# Set up logger (records are written off the event loop by the queue listener in main.py)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Create console handler if not exists
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-
 
 class ChatRequest(BaseModel):
     prompt: str
@@ -29,13 +20,9 @@ class ChatRequest(BaseModel):
 router = APIRouter()
 
 
-@router.post("/chat")
-async def chat(req: ChatRequest, request: Request):
-    timestamp = datetime.now().isoformat()
-    client_ip = request.client.host if request.client else "unknown"
-    
+def _request_headers(request: Request) -> dict:
     # Extract relevant headers
-    headers = {
+    return {
         "user-agent": request.headers.get("user-agent", "unknown"),
         "content-type": request.headers.get("content-type", "unknown"),
         "accept": request.headers.get("accept", "unknown"),
@@ -43,25 +30,69 @@ async def chat(req: ChatRequest, request: Request):
         "x-forwarded-for": request.headers.get("x-forwarded-for", "none"),
         "x-real-ip": request.headers.get("x-real-ip", "none"),
     }
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _stream_chat(prompt: str, request: Request, client_ip: str):
+    # Server-Sent Events: one "text" event per chunk, then "done" (or "error")
+    response_text = ""
+    tool_trace = []
+    try:
+        async for text in stream_agent(prompt, request.app.state.vertex_mode, tool_trace):
+            if len(response_text) < 200:
+                response_text += text
+            yield _sse("text", {"text": text})
+        logger.info(
+            "[API_RESPONSE] IP: %s | Status: 200 OK | Streamed | Tools: %d | Response: %s",
+            client_ip, len(tool_trace), response_text[:200],
+        )
+        yield _sse("done", {})
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(
+            "[API_ERROR] IP: %s | Status: 200 (stream) | Error: %s | Headers: %s",
+            client_ip, error_msg, _request_headers(request),
+        )
+        logger.error("[API_ERROR] IP: %s | Traceback: %s", client_ip, traceback.format_exc())
+        yield _sse("error", {"error": error_msg, "text": f"Error: {error_msg}"})
+
+
+@router.post("/chat")
+async def chat(req: ChatRequest, request: Request):
+    client_ip = request.client.host if request.client else "unknown"
     
     # Validate request
     if not req.prompt or not req.prompt.strip():
-        logger.warning(f"[API_ERROR] {timestamp} | IP: {client_ip} | Status: 400 | Error: Empty prompt | Headers: {headers}")
+        logger.warning("[API_ERROR] IP: %s | Status: 400 | Error: Empty prompt | Headers: %s", client_ip, _request_headers(request))
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Prompt cannot be empty"
         )
     
-    logger.info(f"[API_REQUEST] {timestamp} | IP: {client_ip} | POST /api/chat | Prompt: {req.prompt[:100]} | Headers: {headers}")
+    logger.info("[API_REQUEST] IP: %s | POST /api/chat | Prompt: %s", client_ip, req.prompt[:100])
+    # Headers are only needed for debugging successful requests; error paths log them below
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[API_REQUEST] IP: %s | Headers: %s", client_ip, _request_headers(request))
     
+    # Clients asking for an event stream get text as it is generated
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream_chat(req.prompt, request, client_ip),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
     try:
-        result = await run_agent(req.prompt)
+        result = await run_agent(req.prompt, request.app.state.vertex_mode)
         
         # Check if result indicates an error
         if result.get("error"):
             error_msg = result.get("error", "Unknown error")
-            logger.error(f"[API_ERROR] {timestamp} | IP: {client_ip} | Status: 500 | Error: {error_msg} | Headers: {headers}")
-            return JSONResponse(
+            logger.error("[API_ERROR] IP: %s | Status: 500 | Error: %s | Headers: %s", client_ip, error_msg, _request_headers(request))
+            return ORJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "error": error_msg,
@@ -72,10 +103,10 @@ async def chat(req: ChatRequest, request: Request):
         # Log successful response
         response_text = result.get("text", "")[:200]  # First 200 chars
         tools_used = len(result.get("tools", []))
-        logger.info(f"[API_RESPONSE] {timestamp} | IP: {client_ip} | Status: 200 OK | Tools: {tools_used} | Response: {response_text}")
+        logger.info("[API_RESPONSE] IP: %s | Status: 200 OK | Tools: %d | Response: %s", client_ip, tools_used, response_text)
         
         # Return only the text - tools are internal implementation details (still logged)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "text": result.get("text", "")
@@ -85,11 +116,10 @@ async def chat(req: ChatRequest, request: Request):
         # Re-raise HTTP exceptions (like 400 Bad Request)
         raise
     except Exception as e:
-        import traceback
         error_msg = str(e)
-        logger.error(f"[API_ERROR] {timestamp} | IP: {client_ip} | Status: 500 | Error: {error_msg} | Headers: {headers}")
-        logger.error(f"[API_ERROR] {timestamp} | IP: {client_ip} | Traceback: {traceback.format_exc()}")
-        return JSONResponse(
+        logger.error("[API_ERROR] IP: %s | Status: 500 | Error: %s | Headers: %s", client_ip, error_msg, _request_headers(request))
+        logger.error("[API_ERROR] IP: %s | Traceback: %s", client_ip, traceback.format_exc())
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "error": error_msg,
@@ -1,7 +1,10 @@
 import os
-import json
+import asyncio
+import copy
 import logging
 
+import httpx
+
 from .tools import registry
 
 # Set up logger
@@ -13,10 +16,18 @@ logger.setLevel(logging.INFO)
 # For Vertex AI, may need to use gemini-1.5-pro if 2.0-flash not available
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 
+# Tool schemas are static, so build them once per mode and reuse across requests
+_TOOLS_CACHE = {}
+
+# Initialized models keyed by (vertex_mode, model_name); construction runs
+# vertex_init/genai.configure and fallback probing, so only do it once
+_MODEL_CACHE = {}
+
 
-def _use_vertex_mode() -> bool:
+async def detect_vertex_mode() -> bool:
     # Use Vertex AI when in GCP environment (uses Application Default Credentials)
     # No API key needed when running in GCP
+    # Called once at startup; the result is kept on app.state.vertex_mode
     if os.getenv("USE_VERTEX") == "1":
         return True
     # Check if we're in a GCP environment (has GOOGLE_CLOUD_PROJECT or ADC available)
@@ -24,12 +35,11 @@ def _use_vertex_mode() -> bool:
         return True
     # Try to detect GCP environment via metadata server
     try:
-        import requests
-        response = requests.get(
-            "http://metadata.google.internal/computeMetadata/v1/project/project-id",
-            headers={"Metadata-Flavor": "Google"},
-            timeout=1
-        )
+        async with httpx.AsyncClient(timeout=0.2) as client:
+            response = await client.get(
+                "http://metadata.google.internal/computeMetadata/v1/project/project-id",
+                headers={"Metadata-Flavor": "Google"},
+            )
         if response.status_code == 200:
             return True
     except Exception:
@@ -49,23 +59,33 @@ def _vertex_build_tools():
             FunctionDeclaration(
                 name=d.get("name"),
                 description=d.get("description", ""),
-                parameters=d.get("parameters", {}),
+                # FunctionDeclaration rewrites the schema in place; keep the cached one intact
+                parameters=copy.deepcopy(d.get("parameters", {})),
             )
         )
     return [Tool(function_declarations=decls)]
 
 
-def _google_genai_model():
+def _get_tools(vertex_mode: bool):
+    if vertex_mode not in _TOOLS_CACHE:
+        if vertex_mode:
+            _TOOLS_CACHE[vertex_mode] = _vertex_build_tools()
+        else:
+            _TOOLS_CACHE[vertex_mode] = [{"function_declarations": copy.deepcopy(list(registry.tool_declarations()))}]
+    return _TOOLS_CACHE[vertex_mode]
+
+
+def _google_genai_model(model_name: str):
     import google.generativeai as genai
 
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise RuntimeError("Missing GEMINI_API_KEY. Set it in environment or use Vertex AI in GCP.")
     genai.configure(api_key=api_key)
-    return genai.GenerativeModel(model_name=GEMINI_MODEL)
+    return genai.GenerativeModel(model_name=model_name)
 
 
-def _vertex_model():
+def _vertex_model(model_name: str):
     from vertexai import init as vertex_init
     from vertexai.generative_models import GenerativeModel
 
@@ -74,9 +94,7 @@ def _vertex_model():
     if not project:
         raise RuntimeError("Vertex mode requires GOOGLE_CLOUD_PROJECT env var")
     vertex_init(project=project, location=location)
-    
-    model_name = GEMINI_MODEL
-    
+
     # Try the requested model first
     try:
         return GenerativeModel(model_name)
@@ -99,6 +117,13 @@ def _vertex_model():
         raise
 
 
+def get_model(vertex_mode: bool, model_name: str = GEMINI_MODEL):
+    key = (vertex_mode, model_name)
+    if key not in _MODEL_CACHE:
+        _MODEL_CACHE[key] = _vertex_model(model_name) if vertex_mode else _google_genai_model(model_name)
+    return _MODEL_CACHE[key]
+
+
 def _extract_function_calls(resp):
     calls = []
     try:
@@ -111,11 +136,47 @@ def _extract_function_calls(resp):
     return calls
 
 
-async def run_agent(user_prompt: str):
+def _generate(model, vertex_mode: bool, history, tools, stream: bool = False):
+    if vertex_mode:
+        return model.generate_content(contents=history, tools=tools, stream=stream)
+    return model.generate_content({"contents": history, "tools": tools}, stream=stream)
+
+
+async def _run_tool_calls(calls, history, tool_trace):
+    # Execute tool calls concurrently; trace and history keep the model's order
+    named_args = []
+    for call in calls:
+        name = call.name
+        # Both SDKs return proto-plus FunctionCalls whose args is a MapComposite (or None)
+        args = dict(call.args) if call.args else {}
+        # No orjson dump; %s formatting is left to the logging handler
+        logger.info("[TOOL_CALL] Tool: %s, Args: %s", name, args)
+        named_args.append((name, args))
+
+    results = await asyncio.gather(*[registry.handle_tool(name, args) for name, args in named_args])
+
+    for (name, args), result in zip(named_args, results):
+        logger.info("[TOOL_RESULT] Tool: %s, Result: %.200s", name, result)
+        # Ensure result is JSON serializable
+        if not isinstance(result, (str, int, float, bool, type(None), dict, list)):
+            result = str(result)
+        tool_trace.append({"name": name, "args": args, "result": result})
+
+        history.append({
+            "role": "tool",
+            "parts": [{
+                "function_response": {
+                    "name": name,
+                    "response": {"name": name, "content": result},
+                }
+            }],
+        })
+
+
+async def run_agent(user_prompt: str, vertex_mode: bool, model_name: str = GEMINI_MODEL):
     try:
-        vertex_mode = _use_vertex_mode()
-        model = _vertex_model() if vertex_mode else _google_genai_model()
-        tools = _vertex_build_tools() if vertex_mode else [{"function_declarations": registry.tool_declarations()}]
+        model = get_model(vertex_mode, model_name)
+        tools = _get_tools(vertex_mode)
     except Exception as e:
         return {"text": f"Error initializing model: {str(e)}", "tools": []}
 
@@ -123,10 +184,8 @@ async def run_agent(user_prompt: str):
     tool_trace = []
 
     for _ in range(6):
-        if vertex_mode:
-            resp = model.generate_content(contents=history, tools=tools)
-        else:
-            resp = model.generate_content({"contents": history, "tools": tools})
+        # generate_content is blocking I/O; keep it off the event loop
+        resp = await asyncio.to_thread(_generate, model, vertex_mode, history, tools)
         calls = _extract_function_calls(resp)
 
         # No tool calls → return text if available
@@ -138,34 +197,40 @@ async def run_agent(user_prompt: str):
         if not calls:
             return {"text": text or "", "tools": tool_trace}
 
-        # Execute tool calls
-        for call in calls:
-            name = call.name
-            # Convert MapComposite to dict for JSON serialization
-            if hasattr(call.args, 'to_dict'):
-                args = call.args.to_dict()
-            elif hasattr(call.args, '__dict__'):
-                args = dict(call.args)
-            else:
-                args = dict(call.args) if call.args else {}
-            logger.info(f"[TOOL_CALL] Tool: {name}, Args: {json.dumps(args, default=str)}")
-            result = await registry.handle_tool(name, args)
-            logger.info(f"[TOOL_RESULT] Tool: {name}, Result: {str(result)[:200]}")
-            # Ensure result is JSON serializable
-            if not isinstance(result, (str, int, float, bool, type(None), dict, list)):
-                result = str(result)
-            tool_trace.append({"name": name, "args": args, "result": result})
-
-            history.append({
-                "role": "tool",
-                "parts": [{
-                    "function_response": {
-                        "name": name,
-                        "response": {"name": name, "content": result},
-                    }
-                }],
-            })
+        await _run_tool_calls(calls, history, tool_trace)
 
     return {"text": "Reached tool-call step limit.", "tools": tool_trace}
 
 
+# Streaming variant of run_agent: yields text chunks and appends executed tools to tool_trace.
+# Unlike run_agent, model init failures are raised instead of returned as text.
+async def stream_agent(user_prompt: str, vertex_mode: bool, tool_trace: list, model_name: str = GEMINI_MODEL):
+    try:
+        model = get_model(vertex_mode, model_name)
+        tools = _get_tools(vertex_mode)
+    except Exception as e:
+        raise RuntimeError(f"Error initializing model: {str(e)}") from e
+
+    history = [{"role": "user", "parts": [{"text": user_prompt}]}]
+
+    for _ in range(6):
+        calls = []
+        # Both opening the stream and pulling each chunk block, so run them in a thread
+        # google-generativeai's streamed response is iterable but not an iterator
+        stream = iter(await asyncio.to_thread(_generate, model, vertex_mode, history, tools, True))
+        while (chunk := await asyncio.to_thread(next, stream, None)) is not None:
+            calls.extend(_extract_function_calls(chunk))
+            # Function-call chunks have no text
+            try:
+                text = chunk.text
+            except Exception:
+                text = None
+            if text:
+                yield text
+
+        if not calls:
+            return
+
+        await _run_tool_calls(calls, history, tool_trace)
+
+    yield "Reached tool-call step limit."
@@ -0,0 +1,24 @@
+import httpx
+
+
+# Process-wide client so tool calls reuse pooled keep-alive connections
+# instead of paying a fresh TLS handshake on every invocation
+_client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=20,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
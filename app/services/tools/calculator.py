@@ -12,17 +12,42 @@ _operators = {
 }
 
 
-def _eval(node):
-    if isinstance(node, ast.Num):
-        return node.n
-    if isinstance(node, ast.BinOp) and type(node.op) in _operators:
-        return _operators[type(node.op)](_eval(node.left), _eval(node.right))
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
-        val = _eval(node.operand)
-        return +val if isinstance(node.op, ast.UAdd) else -val
+def _constant(node):
+    # Only numbers are allowed (bool is an int subclass but not a number here)
+    if type(node.value) not in (int, float, complex):
+        raise ValueError("Unsupported expression")
+    return node.value
+
+
+def _binop(node):
+    operator = _operators.get(type(node.op))
+    if operator is None:
+        raise ValueError("Unsupported expression")
+    return operator(_eval(node.left), _eval(node.right))
+
+
+def _unary(node):
+    if type(node.op) is ast.UAdd:
+        return +_eval(node.operand)
+    if type(node.op) is ast.USub:
+        return -_eval(node.operand)
     raise ValueError("Unsupported expression")
 
 
+_dispatch = {
+    ast.Constant: _constant,
+    ast.BinOp: _binop,
+    ast.UnaryOp: _unary,
+}
+
+
+def _eval(node):
+    handler = _dispatch.get(type(node))
+    if handler is None:
+        raise ValueError("Unsupported expression")
+    return handler(node)
+
+
 async def calculator(params: dict):
     expression = (params or {}).get("expression")
     if not expression or not isinstance(expression, str):
@@ -1,31 +1,49 @@
 import re
-import httpx
-from bs4 import BeautifulSoup
+from async_lru import alru_cache
+from selectolax.parser import HTMLParser
+
+from ..http_client import get_client
+
+
+_WS_RE = re.compile(r"\s+")
+_MAX_BYTES = 256 * 1024
 
 
 def extract_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text(" ")
-    text = re.sub(r"\s+", " ", text).strip()
+    tree = HTMLParser(html)
+    tree.strip_tags(["script", "style", "noscript"])
+    root = tree.body or tree.root
+    if root is None:
+        return ""
+    text = root.text(separator=" ")
+    text = _WS_RE.sub(" ", text).strip()
     return text
 
 
+# Failures raise instead of returning, so only successful fetches are cached
+@alru_cache(maxsize=1024, ttl=300)
+async def _fetch(url: str):
+    # Stream the body and stop at _MAX_BYTES; only the first 8000 chars of text are kept anyway
+    async with get_client().stream("GET", url, headers={"user-agent": "gemini-agent/1.0"}) as res:
+        res.raise_for_status()
+        content_type = res.headers.get("content-type", "")
+        if "text" not in content_type and "html" not in content_type:
+            raise ValueError(f"Unsupported content-type: {content_type}")
+        body = bytearray()
+        async for chunk in res.aiter_bytes():
+            body += chunk
+            if len(body) >= _MAX_BYTES:
+                break
+        html = body[:_MAX_BYTES].decode(res.encoding or "utf-8", errors="replace")
+    text = extract_text(html)
+    return {"url": url, "contentType": content_type, "text": text[:8000]}
+
+
 async def fetch_url(params: dict):
     url = (params or {}).get("url")
     if not url:
         return {"error": "Missing url"}
     try:
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
-            res = await client.get(url, headers={"user-agent": "gemini-agent/1.0"})
-            res.raise_for_status()
-            content_type = res.headers.get("content-type", "")
-            if "text" not in content_type and "html" not in content_type:
-                return {"error": f"Unsupported content-type: {content_type}"}
-            text = extract_text(res.text)
-            return {"url": url, "contentType": content_type, "text": text[:8000]}
+        return await _fetch(url)
     except Exception as e:
         return {"error": str(e)}
-
-
@@ -1,10 +1,14 @@
+import functools
+
 from .web_search import web_search
 from .fetch_url import fetch_url
 from .calculator import calculator
 
 
+@functools.lru_cache(maxsize=1)
 def tool_declarations():
-    return [
+    # Static for the process lifetime; callers must not mutate the result
+    return (
         {
             "name": "web_search",
             "description": "Search the web using DuckDuckGo Instant Answer API.",
@@ -35,7 +39,7 @@ def tool_declarations():
                 "required": ["expression"],
             },
         },
-    ]
+    )
 
 
 async def handle_tool(name: str, args: dict):
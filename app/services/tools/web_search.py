@@ -1,40 +1,62 @@
-import httpx
+import itertools
+from async_lru import alru_cache
 
+from ..http_client import get_client
+
+
+_MAX_RESULTS = 8
+
+
+def _valid(topic) -> bool:
+    return bool(topic and topic.get("Text") and topic.get("FirstURL"))
+
+
+def _iter_topics(items):
+    # RelatedTopics mixes plain topics with groups that nest more topics under "Topics"
+    for item in items:
+        if _valid(item):
+            yield item
+        elif item and isinstance(item.get("Topics"), list):
+            yield from item["Topics"]
+
+
+def _row(topic) -> dict:
+    return {"title": topic["Text"][:120], "snippet": topic["Text"], "url": topic["FirstURL"]}
 
-async def web_search(params: dict):
-    query = (params or {}).get("query")
-    region = (params or {}).get("region")
-    if not query:
-        return {"error": "Missing query"}
 
+# Failures raise instead of returning, so only successful searches are cached
+@alru_cache(maxsize=1024, ttl=300)
+async def _search(query: str, region):
     url = "https://api.duckduckgo.com/"
     q = {"q": query, "format": "json"}
     if region:
         q["kl"] = region
 
+    res = await get_client().get(url, params=q, headers={"user-agent": "gemini-agent/1.0"}, timeout=15)
+    res.raise_for_status()
+    data = res.json()
+
+    results = []
+    if data.get("AbstractText"):
+        results.append({
+            "title": data.get("Heading") or "Abstract",
+            "snippet": data.get("AbstractText"),
+            "url": data.get("AbstractURL"),
+        })
+    # Stop walking RelatedTopics as soon as enough results are collected
+    topics = filter(_valid, _iter_topics(data.get("RelatedTopics", []) or []))
+    results.extend(_row(t) for t in itertools.islice(topics, _MAX_RESULTS - len(results)))
+
+    return {"query": query, "results": results}
+
+
+async def web_search(params: dict):
+    query = (params or {}).get("query")
+    region = (params or {}).get("region")
+    if not query:
+        return {"error": "Missing query"}
+
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            res = await client.get(url, params=q, headers={"user-agent": "gemini-agent/1.0"})
-            res.raise_for_status()
-            data = res.json()
-
-        results = []
-        if data.get("AbstractText"):
-            results.append({
-                "title": data.get("Heading") or "Abstract",
-                "snippet": data.get("AbstractText"),
-                "url": data.get("AbstractURL"),
-            })
-        for item in data.get("RelatedTopics", []) or []:
-            if item and item.get("Text") and item.get("FirstURL"):
-                results.append({"title": item["Text"][:120], "snippet": item["Text"], "url": item["FirstURL"]})
-            elif item and isinstance(item.get("Topics"), list):
-                for sub in item["Topics"]:
-                    if sub and sub.get("Text") and sub.get("FirstURL"):
-                        results.append({"title": sub["Text"][:120], "snippet": sub["Text"], "url": sub["FirstURL"]})
-
-        return {"query": query, "results": results[:8]}
+        return await _search(query, region)
     except Exception as e:
         return {"error": str(e)}
-
-
@@ -507,8 +507,12 @@ Type=simple
 User=www-data
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
+# One worker per vCPU by default; override either value in $APP_DIR/.env
+Environment="WEB_CONCURRENCY=$(nproc)"
+Environment="LIMIT_CONCURRENCY=100"
 EnvironmentFile=$APP_DIR/.env
-ExecStart=$APP_DIR/venv/bin/uvicorn app.main:app --host 0.0.0.0 --port 80
+# uvloop must be chosen by uvicorn; app.main is imported inside an already running loop
+ExecStart=$APP_DIR/venv/bin/uvicorn app.main:app --host 0.0.0.0 --port 80 --workers \${WEB_CONCURRENCY} --loop uvloop --http httptools --limit-concurrency \${LIMIT_CONCURRENCY}
 Restart=always
 RestartSec=10
 AmbientCapabilities=CAP_NET_BIND_SERVICE
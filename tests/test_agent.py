@@ -0,0 +1,31 @@
+import asyncio
+import types
+
+from app.services import agent
+
+
+class _StreamedResponse:
+    # Like google-generativeai's GenerateContentResponse: has __iter__ but no __next__
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+
+class _Model:
+    def generate_content(self, *args, stream=False, **kwargs):
+        chunk = types.SimpleNamespace(text="hello", candidates=[])
+        return _StreamedResponse([chunk])
+
+
+async def _collect(gen):
+    return [text async for text in gen]
+
+
+def test_stream_agent_accepts_iterable_responses(monkeypatch):
+    monkeypatch.setattr(agent, "get_model", lambda vertex_mode, model_name=agent.GEMINI_MODEL: _Model())
+    monkeypatch.setattr(agent, "_get_tools", lambda vertex_mode: [])
+
+    gen = agent.stream_agent("hi", vertex_mode=False, tool_trace=[])
+    assert asyncio.run(_collect(gen)) == ["hello"]